@@ -16,7 +16,7 @@ from src.services.providers.hyperliquid import HyperliquidProvider
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class QualityFlags:
     """Data quality flags for enrichment."""
 
@@ -120,43 +120,34 @@ class EnrichmentService:
 
     def _check_staleness(
         self,
-        data_timestamps: Dict[str, str],
-        now: datetime,
+        data_timestamps: Dict[str, float],
+        now_ts: float,
         quality_flags: QualityFlags,
     ) -> None:
         """
         Check data freshness against staleness thresholds.
 
+        Timestamps are unix seconds, so age is a single subtraction.
         Uses thresholds from settings (STALE_MID_S, STALE_L2_S, STALE_CTX_S).
         Adds stale data sources to quality_flags.stale.
         """
         thresholds = self.staleness_thresholds
-        for ts_key, ts_value in data_timestamps.items():
-            try:
-                # Parse timestamp
-                if isinstance(ts_value, str):
-                    ts = datetime.fromisoformat(ts_value.replace("Z", "+00:00"))
-                else:
-                    ts = ts_value
-
-                # Determine threshold based on data type
-                age_seconds = (now - ts).total_seconds()
-
-                if "candles" in ts_key:
-                    threshold = thresholds["candles"]
-                elif "funding" in ts_key:
-                    threshold = thresholds["funding"]
-                elif "mid" in ts_key or "ticker" in ts_key:
-                    threshold = thresholds["ticker"]
-                else:
-                    threshold = thresholds.get("orderbook", 10)
-
-                if age_seconds > threshold:
-                    quality_flags.stale.append(f"{ts_key}: {int(age_seconds)}s old (threshold: {threshold}s)")
-                    logger.warning(f"Stale data detected: {ts_key} is {age_seconds:.1f}s old")
-
-            except Exception as e:
-                logger.warning(f"Failed to check staleness for {ts_key}: {e}")
+        for ts_key, ts in data_timestamps.items():
+            age_seconds = now_ts - ts
+
+            # Determine threshold based on data type
+            if "candles" in ts_key:
+                threshold = thresholds["candles"]
+            elif "funding" in ts_key:
+                threshold = thresholds["funding"]
+            elif "mid" in ts_key or "ticker" in ts_key:
+                threshold = thresholds["ticker"]
+            else:
+                threshold = thresholds.get("orderbook", 10)
+
+            if age_seconds > threshold:
+                quality_flags.stale.append(f"{ts_key}: {int(age_seconds)}s old (threshold: {threshold}s)")
+                logger.warning(f"Stale data detected: {ts_key} is {age_seconds:.1f}s old")
 
     def _validate_market_data(
         self,
@@ -235,7 +226,7 @@ class EnrichmentService:
 
         now = datetime.now(timezone.utc)
         quality_flags = QualityFlags(stale=[], missing=[], out_of_range=[], provider_errors=[])
-        data_timestamps: Dict[str, str] = {}
+        data_timestamps: Dict[str, float] = {}  # Unix seconds, converted to ISO on output
 
         # Calculate signal age
         signal_age_seconds = 0.0
@@ -243,7 +234,7 @@ class EnrichmentService:
             try:
                 signal_ts = datetime.fromisoformat(signal_ts_str.replace("Z", "+00:00"))
                 signal_age_seconds = (now - signal_ts).total_seconds()
-                data_timestamps["signal_ts"] = signal_ts_str
+                data_timestamps["signal_ts"] = signal_ts.timestamp()
             except (ValueError, TypeError) as e:
                 logger.warning(f"Failed to parse signal timestamp: {signal_ts_str}, error: {e}")
 
@@ -267,7 +258,7 @@ class EnrichmentService:
         constraints = config.get("constraints", self.DEFAULT_CONSTRAINTS)
 
         # Validate data quality
-        self._check_staleness(data_timestamps, now, quality_flags)
+        self._check_staleness(data_timestamps, now.timestamp(), quality_flags)
         self._validate_market_data(market_data, quality_flags)
         self._validate_ta_data(ta_data, quality_flags)
 
@@ -292,7 +283,10 @@ class EnrichmentService:
             derivs_data=derivs_data,
             levels_data=None,  # TODO: Implement S/R levels
             constraints=constraints,
-            data_timestamps=data_timestamps,
+            data_timestamps={
+                key: datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+                for key, ts in data_timestamps.items()
+            },
             quality_flags=quality_flags,
             enriched_payload=enriched_payload,
             signal_age_seconds=signal_age_seconds,
@@ -303,12 +297,12 @@ class EnrichmentService:
         symbol: str,
         entry_price: float,
         quality_flags: QualityFlags,
-        data_timestamps: Dict[str, str],
+        data_timestamps: Dict[str, float],
     ) -> Optional[Dict[str, Any]]:
         """Fetch current market data (ticker + orderbook)."""
         try:
             ticker = await self.provider.get_ticker(symbol)
-            data_timestamps["mid_ts"] = ticker.timestamp.isoformat()
+            data_timestamps["mid_ts"] = ticker.timestamp.timestamp()
 
             # Calculate price drift from entry
             price_drift_bps = 0
@@ -343,7 +337,7 @@ class EnrichmentService:
         timeframes: List[str],
         config: Dict,
         quality_flags: QualityFlags,
-        data_timestamps: Dict[str, str],
+        data_timestamps: Dict[str, float],
     ) -> Optional[Dict[str, Any]]:
         """Fetch candles and compute TA indicators for each timeframe."""
         ta_data: Dict[str, Any] = {"timeframes": {}}
@@ -379,7 +373,7 @@ class EnrichmentService:
                 candles = await self.provider.get_ohlcv(symbol, tf, limit=candle_limit)
 
                 if candles:
-                    data_timestamps[f"candles_{tf}_ts"] = candles[-1].timestamp.isoformat()
+                    data_timestamps[f"candles_{tf}_ts"] = candles[-1].timestamp.timestamp()
 
                     # Compute TA
                     ta_result = TACalculator.calculate_all(
@@ -414,7 +408,7 @@ class EnrichmentService:
         self,
         symbol: str,
         quality_flags: QualityFlags,
-        data_timestamps: Dict[str, str],
+        data_timestamps: Dict[str, float],
     ) -> Optional[Dict[str, Any]]:
         """Fetch perpetual derivatives data (funding, OI, mark price)."""
         derivs_data: Dict[str, Any] = {}
@@ -422,7 +416,7 @@ class EnrichmentService:
         try:
             # Funding rate
             funding = await self.provider.get_funding_rate(symbol)
-            data_timestamps["funding_ts"] = funding.timestamp.isoformat()
+            data_timestamps["funding_ts"] = funding.timestamp.timestamp()
             derivs_data["funding_rate"] = funding.rate
             derivs_data["predicted_funding"] = funding.predicted_rate
             derivs_data["funding_interval_h"] = 1  # Hyperliquid uses 1h funding
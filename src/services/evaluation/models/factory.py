@@ -36,6 +36,28 @@ VALID_ENTRY_TYPES = {"market", "limit"}
 VALID_STOP_METHODS = {"fixed", "atr", "trailing"}
 
 
+# Provider name -> adapter class, filled on first lookup by _get_adapters()
+_ADAPTERS: Dict[str, Type[BaseModelAdapter]] = {}
+
+
+def _get_adapters() -> Dict[str, Type[BaseModelAdapter]]:
+    """Return the provider dispatch table, importing adapters on first use."""
+    if not _ADAPTERS:
+        # Import here to avoid circular imports
+        from src.services.evaluation.models.openai_adapter import OpenAIAdapter
+        from src.services.evaluation.models.google_adapter import GoogleAdapter
+        from src.services.evaluation.models.anthropic_adapter import AnthropicAdapter
+        from src.services.evaluation.models.deepseek_adapter import DeepSeekAdapter
+
+        _ADAPTERS.update({
+            "openai": OpenAIAdapter,
+            "google": GoogleAdapter,
+            "anthropic": AnthropicAdapter,
+            "deepseek": DeepSeekAdapter,
+        })
+    return _ADAPTERS
+
+
 def get_adapter_class(provider: str) -> Type[BaseModelAdapter]:
     """Get the adapter class for a provider.
 
@@ -48,18 +70,7 @@ def get_adapter_class(provider: str) -> Type[BaseModelAdapter]:
     Raises:
         ValueError: If provider is not supported
     """
-    # Import here to avoid circular imports
-    from src.services.evaluation.models.openai_adapter import OpenAIAdapter
-    from src.services.evaluation.models.google_adapter import GoogleAdapter
-    from src.services.evaluation.models.anthropic_adapter import AnthropicAdapter
-    from src.services.evaluation.models.deepseek_adapter import DeepSeekAdapter
-
-    adapters = {
-        "openai": OpenAIAdapter,
-        "google": GoogleAdapter,
-        "anthropic": AnthropicAdapter,
-        "deepseek": DeepSeekAdapter,
-    }
+    adapters = _get_adapters()
 
     provider_lower = provider.lower()
     if provider_lower not in adapters:
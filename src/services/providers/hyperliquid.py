@@ -1,7 +1,11 @@
 """Hyperliquid market data provider."""
 
+import re
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 
 import httpx
 
@@ -20,6 +24,9 @@ from src.services.providers.base import (
 
 logger = get_logger(__name__)
 
+# Trailing perp marker and/or quote currency, e.g. "-PERP", "/USD", "-PERP/USDC"
+_SYMBOL_SUFFIX = re.compile(r"(?:-?PERP)?(?:/USD[CT]?|-USD|USD)?$")
+
 
 class HyperliquidProvider(MarketDataProvider):
     """
@@ -45,8 +52,8 @@ class HyperliquidProvider(MarketDataProvider):
         self.timeout = settings.PROVIDER_TIMEOUT_MS / 1000
         self._client: httpx.AsyncClient | None = None
         # Cache for asset metadata (refreshed periodically)
-        self._asset_ctxs_cache: Optional[Dict[str, Any]] = None
-        self._cache_timestamp: Optional[datetime] = None
+        self._asset_ctxs_cache: Optional[Mapping[str, Any]] = None
+        self._cache_expires_at = 0.0  # time.monotonic() deadline
         self._cache_ttl_seconds = 5  # Refresh metadata every 5 seconds
 
     @property
@@ -85,20 +92,19 @@ class HyperliquidProvider(MarketDataProvider):
             logger.error(f"Hyperliquid request failed: {str(e)}")
             raise ProviderError(self.name, f"Request failed: {str(e)}")
 
-    async def _get_asset_contexts(self, force_refresh: bool = False) -> Dict[str, Any]:
+    async def _get_asset_contexts(self, force_refresh: bool = False) -> Mapping[str, Any]:
         """
         Get cached asset contexts (metadata + funding + OI).
 
-        Returns dict mapping symbol -> asset context data.
+        Returns read-only mapping of symbol -> asset context data. Each context
+        is copied from the response with "_meta" added, so callers cannot
+        modify the cache and the response objects are left untouched.
         """
-        now = datetime.now(timezone.utc)
-
-        # Check if cache is valid
+        # Check if cache is valid (monotonic clock, immune to wall-clock jumps)
         if (
             not force_refresh
             and self._asset_ctxs_cache is not None
-            and self._cache_timestamp is not None
-            and (now - self._cache_timestamp).total_seconds() < self._cache_ttl_seconds
+            and time.monotonic() < self._cache_expires_at
         ):
             return self._asset_ctxs_cache
 
@@ -111,33 +117,31 @@ class HyperliquidProvider(MarketDataProvider):
         asset_ctxs = data[1]
 
         # Build lookup dict by symbol
-        result = {}
+        result: Dict[str, Any] = {}
         universe = meta.get("universe", [])
         for i, asset_info in enumerate(universe):
             symbol = asset_info.get("name", "")
             if i < len(asset_ctxs):
-                result[symbol] = asset_ctxs[i]
-                result[symbol]["_meta"] = asset_info
+                result[symbol] = MappingProxyType({**asset_ctxs[i], "_meta": asset_info})
 
-        self._asset_ctxs_cache = result
-        self._cache_timestamp = now
+        self._asset_ctxs_cache = MappingProxyType(result)
+        self._cache_expires_at = time.monotonic() + self._cache_ttl_seconds
 
-        return result
+        return self._asset_ctxs_cache
 
-    def _normalize_symbol(self, symbol: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _normalize_symbol(symbol: str) -> str:
         """
         Normalize symbol to Hyperliquid format.
 
         Hyperliquid uses: BTC, ETH, SOL (no -PERP suffix)
-        We accept: BTC, BTC-PERP, BTCPERP, BTC/USD
+        We accept: BTC, BTC-PERP, BTCPERP, BTC/USD, BTC/USDT, BTC/USDC,
+        BTC-USD, BTCUSD, ETH-PERP/USDC (one perp marker plus one quote)
+
+        Pure string transform called on every request, so results are cached.
         """
-        # Remove common suffixes (order matters - check longer suffixes first)
-        normalized = symbol.upper()
-        for suffix in ["-PERP", "PERP", "/USDT", "/USD", "-USD", "USD"]:
-            if normalized.endswith(suffix):
-                normalized = normalized[: -len(suffix)]
-                break  # Only remove one suffix
-        return normalized
+        return _SYMBOL_SUFFIX.sub("", symbol.upper(), count=1)
 
     async def get_ticker(self, symbol: str) -> Ticker:
         """Get current ticker data from Hyperliquid."""
@@ -0,0 +1,69 @@
+"""In-process Redis Streams fake for queue tests.
+
+Implements the subset of RedisClient used by QueueProducer and QueueConsumer,
+backed by plain dicts and lists.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+
+class FakeStreams:
+    """Dict-backed stand-in for RedisClient stream operations."""
+
+    def __init__(self):
+        self.streams: Dict[str, List[Tuple[str, dict]]] = {}
+        # (stream, group) -> index of the next undelivered entry
+        self.groups: Dict[Tuple[str, str], int] = {}
+        self.acked: Dict[Tuple[str, str], List[str]] = {}
+
+    async def xgroup_create(
+        self, stream: str, group: str, id: str = "$", mkstream: bool = True
+    ) -> bool:
+        if stream not in self.streams:
+            if not mkstream:
+                raise RuntimeError(f"ERR no such key: {stream}")
+            self.streams[stream] = []
+        # Like Redis, "$" starts the group after the last entry and "0" replays
+        # the whole stream; an existing group keeps its cursor (BUSYGROUP)
+        start = len(self.streams[stream]) if id == "$" else 0
+        self.groups.setdefault((stream, group), start)
+        return True
+
+    async def xadd(self, stream: str, fields: dict, maxlen: Optional[int] = None) -> str:
+        entries = self.streams.setdefault(stream, [])
+        msg_id = f"{len(entries) + 1}-0"
+        entries.append((msg_id, dict(fields)))
+        return msg_id
+
+    async def xreadgroup(
+        self,
+        group: str,
+        consumer: str,
+        streams: dict,
+        count: Optional[int] = None,
+        block: Optional[int] = None,
+    ) -> list:
+        # Yield to the loop like a real network read would
+        await asyncio.sleep(0)
+
+        result = []
+        for stream in streams:
+            entries = self.streams.get(stream, [])
+            start = self.groups.get((stream, group), 0)
+            end = len(entries) if count is None else min(len(entries), start + count)
+            if end > start:
+                result.append((stream, entries[start:end]))
+                self.groups[(stream, group)] = end
+
+        if not result and block:
+            # Nothing to deliver: wait out the block timeout like the real call
+            await asyncio.sleep(block / 1000)
+        return result
+
+    async def xack(self, stream: str, group: str, *ids: str) -> int:
+        self.acked.setdefault((stream, group), []).extend(ids)
+        return len(ids)
+
+    async def xlen(self, stream: str) -> int:
+        return len(self.streams.get(stream, []))
@@ -0,0 +1,11 @@
+"""Shared fixtures for service tests."""
+
+import pytest
+
+from tests.test_services._fake_streams import FakeStreams
+
+
+@pytest.fixture
+def fake_streams() -> FakeStreams:
+    """In-process Redis Streams fake, fresh for each test."""
+    return FakeStreams()
@@ -252,8 +252,8 @@ class TestQualityValidation:
         now = datetime.now(timezone.utc)
         old_time = now - timedelta(seconds=60)  # 60 seconds old
 
-        data_timestamps = {"mid_ts": old_time.isoformat()}
-        service._check_staleness(data_timestamps, now, quality_flags)
+        data_timestamps = {"mid_ts": old_time.timestamp()}
+        service._check_staleness(data_timestamps, now.timestamp(), quality_flags)
 
         # mid_ts has 10s threshold, so 60s should be stale
         assert len(quality_flags.stale) > 0
@@ -270,8 +270,8 @@ class TestQualityValidation:
         now = datetime.now(timezone.utc)
         fresh_time = now - timedelta(seconds=2)  # 2 seconds old
 
-        data_timestamps = {"mid_ts": fresh_time.isoformat()}
-        service._check_staleness(data_timestamps, now, quality_flags)
+        data_timestamps = {"mid_ts": fresh_time.timestamp()}
+        service._check_staleness(data_timestamps, now.timestamp(), quality_flags)
 
         # 2s is within 10s threshold
         assert len(quality_flags.stale) == 0
@@ -1,18 +1,81 @@
 """Tests for the Hyperliquid provider."""
 
 import pytest
+import pytest_asyncio
+from collections import Counter
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 import httpx
+import numpy as np
 
+from src.core.exceptions import ProviderError
+from src.services.providers.hyperliquid import HyperliquidProvider
 
-@pytest.fixture
+
+# Fixed "current" time for provider calls (matches the mock l2Book timestamp)
+_NOW = datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    """datetime whose now() always returns _NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return _NOW.astimezone(tz) if tz else _NOW.replace(tzinfo=None)
+
+
+def _http_500() -> httpx.HTTPStatusError:
+    """Fresh HTTP 500 error (a new instance per raise keeps tracebacks separate)."""
+    # Only status_code/text are read from the response in _post's error path
+    return httpx.HTTPStatusError(
+        "Server error",
+        request=None,
+        response=SimpleNamespace(status_code=500, text="Internal Server Error"),
+    )
+
+
+def _connection_failed() -> httpx.RequestError:
+    """Fresh network error."""
+    return httpx.RequestError("Connection failed")
+
+
+class FakePostRouter:
+    """Stand-in for HyperliquidProvider._post that answers by request type."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = Counter()
+
+    async def __call__(self, data):
+        request_type = data.get("type")
+        self.calls[request_type] += 1
+        return self.routes[request_type]
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def provider():
+    """Shared HyperliquidProvider for the module (closed once at teardown)."""
+    provider = HyperliquidProvider()
+    yield provider
+    await provider.close()
+
+
+@pytest.fixture(autouse=True)
+def _reset_provider_cache(provider):
+    """Clear asset context cache so tests don't observe each other's fetches."""
+    yield
+    provider._asset_ctxs_cache = None
+    provider._cache_expires_at = 0.0
+
+
+@pytest.fixture(scope="session")
 def mock_all_mids_response():
     """Mock response for allMids endpoint."""
     return {"BTC": "50000.0", "ETH": "3000.0", "SOL": "100.0"}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_l2_book_response():
     """Mock response for l2Book endpoint."""
     return {
@@ -25,28 +88,49 @@ def mock_l2_book_response():
     }
 
 
-@pytest.fixture
+# 100 hourly candles, built once at import time as a structured array so the
+# canonical series can also be consumed column-wise
+_CANDLE_BASE_TS = 1700000000000
+_CANDLE_HOUR_MS = 3600000
+_CANDLE_ARR = np.empty(
+    100,
+    dtype=[
+        ("t", "i8"),
+        ("T", "i8"),
+        ("o", "f8"),
+        ("h", "f8"),
+        ("l", "f8"),
+        ("c", "f8"),
+        ("v", "f8"),
+        ("n", "i4"),
+    ],
+)
+_steps = np.arange(len(_CANDLE_ARR))
+_CANDLE_ARR["t"] = _CANDLE_BASE_TS + _steps * _CANDLE_HOUR_MS
+_CANDLE_ARR["T"] = _CANDLE_ARR["t"] + _CANDLE_HOUR_MS
+_CANDLE_ARR["o"] = 50000 + _steps * 10
+_CANDLE_ARR["h"] = 50020 + _steps * 10
+_CANDLE_ARR["l"] = 49980 + _steps * 10
+_CANDLE_ARR["c"] = 50010 + _steps * 10
+_CANDLE_ARR["v"] = 100.5
+_CANDLE_ARR["n"] = 50
+
+# Hyperliquid sends prices and volume as strings
+_CANDLE_RESPONSE = tuple(
+    {"t": t, "T": t_close, "o": str(o), "h": str(hi), "l": str(lo), "c": str(c), "v": str(v), "n": n}
+    for t, t_close, o, hi, lo, c, v, n in _CANDLE_ARR.tolist()
+)
+
+
+@pytest.fixture(scope="session")
 def mock_candle_response():
     """Mock response for candleSnapshot endpoint."""
-    base_ts = 1700000000000
-    return [
-        {
-            "t": base_ts + i * 3600000,
-            "T": base_ts + i * 3600000 + 3600000,
-            "o": str(50000 + i * 10),
-            "h": str(50020 + i * 10),
-            "l": str(49980 + i * 10),
-            "c": str(50010 + i * 10),
-            "v": "100.5",
-            "n": 50,
-        }
-        for i in range(100)
-    ]
+    return _CANDLE_RESPONSE
 
 
 @pytest.fixture
 def mock_meta_and_asset_ctxs_response():
-    """Mock response for metaAndAssetCtxs endpoint."""
+    """Mock response for metaAndAssetCtxs endpoint (fresh per test, the dicts are mutable)."""
     return [
         {
             "universe": [
@@ -77,34 +161,36 @@ def mock_meta_and_asset_ctxs_response():
 class TestHyperliquidProvider:
     """Test Hyperliquid provider methods."""
 
-    def test_normalize_symbol(self):
-        """Test symbol normalization."""
-        from src.services.providers.hyperliquid import HyperliquidProvider
-
-        provider = HyperliquidProvider()
+    @pytest.fixture(autouse=True)
+    def _frozen_time(self, monkeypatch):
+        """Freeze the provider's clock for deterministic timestamps."""
+        monkeypatch.setattr("src.services.providers.hyperliquid.datetime", _FrozenDatetime)
 
-        assert provider._normalize_symbol("BTC") == "BTC"
-        assert provider._normalize_symbol("btc") == "BTC"
-        assert provider._normalize_symbol("BTC-PERP") == "BTC"
-        assert provider._normalize_symbol("BTCPERP") == "BTC"
-        assert provider._normalize_symbol("BTC/USD") == "BTC"
+    @pytest.mark.parametrize(
+        "raw,expected",
+        [
+            ("BTC", "BTC"),
+            ("btc", "BTC"),
+            ("BTC-PERP", "BTC"),
+            ("BTCPERP", "BTC"),
+            ("BTC/USD", "BTC"),
+            ("BTC/USDT", "BTC"),
+            ("BTC/USDC", "BTC"),
+            ("BTC-USD", "BTC"),
+            ("BTCUSD", "BTC"),
+            ("ETH-PERP/USDC", "ETH"),
+        ],
+    )
+    def test_normalize_symbol(self, provider, raw, expected):
+        """Test symbol normalization."""
+        assert provider._normalize_symbol(raw) == expected
 
-    @pytest.mark.asyncio
-    async def test_get_ticker(self, mock_all_mids_response, mock_l2_book_response):
+    async def test_get_ticker(self, provider, monkeypatch, mock_all_mids_response, mock_l2_book_response):
         """Test get_ticker fetches and parses correctly."""
-        from src.services.providers.hyperliquid import HyperliquidProvider
-
-        provider = HyperliquidProvider()
-
-        # Mock the _post method
-        async def mock_post(data):
-            if data.get("type") == "allMids":
-                return mock_all_mids_response
-            elif data.get("type") == "l2Book":
-                return mock_l2_book_response
-            return {}
-
-        provider._post = mock_post
+        router = FakePostRouter(
+            {"allMids": mock_all_mids_response, "l2Book": mock_l2_book_response}
+        )
+        monkeypatch.setattr(provider, "_post", router)
 
         ticker = await provider.get_ticker("BTC")
 
@@ -114,38 +200,18 @@ class TestHyperliquidProvider:
         assert ticker.ask == 50010.0
         assert ticker.spread_bps > 0
 
-        await provider.close()
-
-    @pytest.mark.asyncio
-    async def test_get_ticker_symbol_not_found(self, mock_all_mids_response):
+    async def test_get_ticker_symbol_not_found(self, provider, monkeypatch, mock_all_mids_response):
         """Test get_ticker raises error for unknown symbol."""
-        from src.services.providers.hyperliquid import HyperliquidProvider
-        from src.core.exceptions import ProviderError
-
-        provider = HyperliquidProvider()
-
-        async def mock_post(data):
-            return mock_all_mids_response
-
-        provider._post = mock_post
+        monkeypatch.setattr(provider, "_post", FakePostRouter({"allMids": mock_all_mids_response}))
 
         with pytest.raises(ProviderError) as exc_info:
             await provider.get_ticker("UNKNOWN")
 
         assert "not found" in str(exc_info.value)
-        await provider.close()
 
-    @pytest.mark.asyncio
-    async def test_get_orderbook(self, mock_l2_book_response):
+    async def test_get_orderbook(self, provider, monkeypatch, mock_l2_book_response):
         """Test get_orderbook fetches and parses correctly."""
-        from src.services.providers.hyperliquid import HyperliquidProvider
-
-        provider = HyperliquidProvider()
-
-        async def mock_post(data):
-            return mock_l2_book_response
-
-        provider._post = mock_post
+        monkeypatch.setattr(provider, "_post", FakePostRouter({"l2Book": mock_l2_book_response}))
 
         book = await provider.get_orderbook("BTC", depth=5)
 
@@ -155,19 +221,11 @@ class TestHyperliquidProvider:
         assert book.bids[0].price == 49990.0
         assert book.asks[0].price == 50010.0
 
-        await provider.close()
-
-    @pytest.mark.asyncio
-    async def test_get_ohlcv(self, mock_candle_response):
+    async def test_get_ohlcv(self, provider, monkeypatch, mock_candle_response):
         """Test get_ohlcv fetches and parses correctly."""
-        from src.services.providers.hyperliquid import HyperliquidProvider
-
-        provider = HyperliquidProvider()
-
-        async def mock_post(data):
-            return mock_candle_response
-
-        provider._post = mock_post
+        monkeypatch.setattr(
+            provider, "_post", FakePostRouter({"candleSnapshot": mock_candle_response})
+        )
 
         candles = await provider.get_ohlcv("BTC", "1h", limit=50)
 
@@ -175,40 +233,25 @@ class TestHyperliquidProvider:
         assert candles[0].close > 0
         assert candles[0].timestamp is not None
 
-        await provider.close()
-
-    @pytest.mark.asyncio
-    async def test_get_funding_rate(self, mock_meta_and_asset_ctxs_response):
+    async def test_get_funding_rate(self, provider, monkeypatch, mock_meta_and_asset_ctxs_response):
         """Test get_funding_rate fetches and parses correctly."""
-        from src.services.providers.hyperliquid import HyperliquidProvider
-
-        provider = HyperliquidProvider()
-
-        async def mock_post(data):
-            return mock_meta_and_asset_ctxs_response
-
-        provider._post = mock_post
+        monkeypatch.setattr(
+            provider, "_post", FakePostRouter({"metaAndAssetCtxs": mock_meta_and_asset_ctxs_response})
+        )
 
         funding = await provider.get_funding_rate("BTC")
 
         assert funding.symbol == "BTC"
         assert funding.rate == 0.0001
         assert funding.predicted_rate == 0.00015
-        assert funding.next_funding_time is not None
-
-        await provider.close()
+        assert funding.next_funding_time == datetime(2023, 11, 14, 23, 0, tzinfo=timezone.utc)
+        assert funding.timestamp == _NOW
 
-    @pytest.mark.asyncio
-    async def test_get_open_interest(self, mock_meta_and_asset_ctxs_response):
+    async def test_get_open_interest(self, provider, monkeypatch, mock_meta_and_asset_ctxs_response):
         """Test get_open_interest fetches and parses correctly."""
-        from src.services.providers.hyperliquid import HyperliquidProvider
-
-        provider = HyperliquidProvider()
-
-        async def mock_post(data):
-            return mock_meta_and_asset_ctxs_response
-
-        provider._post = mock_post
+        monkeypatch.setattr(
+            provider, "_post", FakePostRouter({"metaAndAssetCtxs": mock_meta_and_asset_ctxs_response})
+        )
 
         oi = await provider.get_open_interest("BTC")
 
@@ -217,83 +260,58 @@ class TestHyperliquidProvider:
         # OI USD = contracts * mark price
         assert oi.oi_usd == 10000.0 * 50005.0
 
-        await provider.close()
-
-    @pytest.mark.asyncio
-    async def test_asset_contexts_caching(self, mock_meta_and_asset_ctxs_response):
+    async def test_asset_contexts_caching(self, provider, monkeypatch, mock_meta_and_asset_ctxs_response):
         """Test asset contexts are cached."""
-        from src.services.providers.hyperliquid import HyperliquidProvider
-
-        provider = HyperliquidProvider()
-        call_count = 0
-
-        async def mock_post(data):
-            nonlocal call_count
-            if data.get("type") == "metaAndAssetCtxs":
-                call_count += 1
-            return mock_meta_and_asset_ctxs_response
-
-        provider._post = mock_post
+        router = FakePostRouter({"metaAndAssetCtxs": mock_meta_and_asset_ctxs_response})
+        monkeypatch.setattr(provider, "_post", router)
 
         # Call twice
         await provider._get_asset_contexts()
         await provider._get_asset_contexts()
 
         # Should only fetch once due to caching
-        assert call_count == 1
+        assert router.calls["metaAndAssetCtxs"] == 1
+
+    async def test_asset_contexts_do_not_mutate_response(
+        self, provider, monkeypatch, mock_meta_and_asset_ctxs_response
+    ):
+        """Test cached contexts are read-only copies of the response."""
+        monkeypatch.setattr(
+            provider, "_post", FakePostRouter({"metaAndAssetCtxs": mock_meta_and_asset_ctxs_response})
+        )
 
-        await provider.close()
+        ctxs = await provider._get_asset_contexts()
+
+        assert ctxs["BTC"]["_meta"]["name"] == "BTC"
+        assert all("_meta" not in ctx for ctx in mock_meta_and_asset_ctxs_response[1])
+        with pytest.raises(TypeError):
+            ctxs["BTC"]["funding"] = "999"
 
 
 @pytest.mark.unit
 class TestHyperliquidProviderErrors:
     """Test Hyperliquid provider error handling."""
 
-    @pytest.mark.asyncio
-    async def test_http_error_handling(self):
+    async def test_http_error_handling(self, provider, monkeypatch):
         """Test HTTP errors are converted to ProviderError."""
-        from src.services.providers.hyperliquid import HyperliquidProvider
-        from src.core.exceptions import ProviderError
-
-        provider = HyperliquidProvider()
-
-        # Create a mock response for HTTP error
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error"
-
         # Mock at the HTTP client level to test _post error handling
         mock_client = AsyncMock()
-        mock_client.post = AsyncMock(
-            side_effect=httpx.HTTPStatusError(
-                "Server error", request=MagicMock(), response=mock_response
-            )
-        )
-        provider._client = mock_client
+        mock_client.post = AsyncMock(side_effect=_http_500())
+        monkeypatch.setattr(provider, "_client", mock_client)
 
         with pytest.raises(ProviderError) as exc_info:
             await provider.get_ticker("BTC")
 
         assert "HTTP 500" in str(exc_info.value)
-        await provider.close()
 
-    @pytest.mark.asyncio
-    async def test_request_error_handling(self):
+    async def test_request_error_handling(self, provider, monkeypatch):
         """Test network errors are converted to ProviderError."""
-        from src.services.providers.hyperliquid import HyperliquidProvider
-        from src.core.exceptions import ProviderError
-
-        provider = HyperliquidProvider()
-
         # Mock at the HTTP client level to test _post error handling
         mock_client = AsyncMock()
-        mock_client.post = AsyncMock(
-            side_effect=httpx.RequestError("Connection failed")
-        )
-        provider._client = mock_client
+        mock_client.post = AsyncMock(side_effect=_connection_failed())
+        monkeypatch.setattr(provider, "_client", mock_client)
 
         with pytest.raises(ProviderError) as exc_info:
             await provider.get_ticker("BTC")
 
         assert "Request failed" in str(exc_info.value)
-        await provider.close()
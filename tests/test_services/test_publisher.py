@@ -1,14 +1,32 @@
 """Tests for publisher service."""
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+
+from src.models.schemas.decision import EntryPlan, ModelDecision, ModelMeta, RiskPlan
+from src.services.publisher.ws_server import WebSocketManager
+
+pytestmark = pytest.mark.unit
+
+
+class _WSStub:
+    """Minimal stand-in for a FastAPI WebSocket."""
+
+    def __init__(self):
+        self.accepted = False
+        self.sent = []
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def close(self):
+        pass
 
 
-@pytest.mark.unit
 def test_decision_schema():
     """Test decision schema."""
-    from src.models.schemas.decision import ModelDecision, ModelMeta
-
     meta = ModelMeta(
         model_name="chatgpt",
         model_version="gpt-4o",
@@ -28,11 +46,8 @@ def test_decision_schema():
     assert "bullish_trend" in decision.reasons
 
 
-@pytest.mark.unit
 def test_decision_types():
     """Test all decision types are valid."""
-    from src.models.schemas.decision import ModelDecision, ModelMeta
-
     valid_decisions = [
         "FOLLOW_ENTER",
         "IGNORE",
@@ -57,21 +72,15 @@ def test_decision_types():
         assert decision.decision == decision_type
 
 
-@pytest.mark.unit
 async def test_ws_manager_subscription():
     """Test WebSocket manager subscription handling."""
-    from src.services.publisher.ws_server import WebSocketManager
-
     manager = WebSocketManager()
 
-    # Mock WebSocket
-    mock_ws = MagicMock()
-    mock_ws.accept = AsyncMock()
-    mock_ws.send_json = AsyncMock()
-    mock_ws.close = AsyncMock()
+    mock_ws = _WSStub()
 
     # Test connect
     sub_id = await manager.connect(mock_ws)
+    assert mock_ws.accepted
     assert sub_id is not None
     assert sub_id in manager.subscriptions
 
@@ -80,21 +89,15 @@ async def test_ws_manager_subscription():
     assert sub_id not in manager.subscriptions
 
 
-@pytest.mark.unit
 def test_entry_plan_schema():
     """Test entry plan schema."""
-    from src.models.schemas.decision import EntryPlan
-
     plan = EntryPlan(type="limit", offset_bps=-5.0)
     assert plan.type == "limit"
     assert plan.offset_bps == -5.0
 
 
-@pytest.mark.unit
 def test_risk_plan_schema():
     """Test risk plan schema."""
-    from src.models.schemas.decision import RiskPlan
-
     plan = RiskPlan(stop_method="atr", atr_multiple=2.0)
     assert plan.stop_method == "atr"
     assert plan.atr_multiple == 2.0
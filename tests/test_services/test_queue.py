@@ -12,78 +12,130 @@ The queue provides at-least-once delivery semantics with automatic
 acknowledgment tracking and dead letter queue support.
 """
 
-import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import inspect
 import json
 
+import pytest
+from unittest.mock import create_autospec, patch
+
+from src.core.config import settings
+from src.services.queue.consumer import QueueConsumer
+from src.services.queue.producer import QueueProducer
+from src.services.queue.redis_client import RedisClient
+
+pytestmark = pytest.mark.unit
+
+
+class _HealthRedis:
+    """Raw Redis stand-in exposing only the health-check commands."""
+
+    __slots__ = ("ping_calls", "xlen_calls")
+
+    def __init__(self):
+        self.ping_calls = 0
+        self.xlen_calls = []
+
+    async def ping(self):
+        self.ping_calls += 1
+        return True
+
+    async def xlen(self, stream):
+        self.xlen_calls.append(stream)
+        return 42
+
+
+class _ConcreteConsumer(QueueConsumer):
+    """Minimal concrete QueueConsumer for exercising base-class behavior."""
+
+    async def process_message(self, event_id, payload):
+        return True
+
+    def _get_stage_name(self):
+        return "test"
+
+
+class _RecordingConsumer(_ConcreteConsumer):
+    """Consumer that records one message and then stops its run loop."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received = []
+
+    async def process_message(self, event_id, payload):
+        self.received.append((event_id, payload))
+        self.stop()
+        return True
+
 
-@pytest.mark.unit
 class TestQueueProducer:
     """Tests for QueueProducer message enqueueing."""
 
-    @pytest.fixture
-    def mock_redis(self):
-        """Create a mock Redis client."""
-        redis = MagicMock()
-        redis.xadd = AsyncMock(return_value="1234567890-0")
+    @pytest.fixture(scope="class")
+    def xadd_calls(self):
+        """(stream, fields) pairs recorded by the mocked xadd."""
+        return []
+
+    @pytest.fixture(scope="class")
+    def mock_redis(self, xadd_calls):
+        """Create a RedisClient spec-mock shared by the class."""
+        redis = create_autospec(RedisClient, instance=True)
+
+        def record_xadd(stream, fields, maxlen=None):
+            xadd_calls.append((stream, fields))
+            return "1234567890-0"
+
+        redis.xadd.side_effect = record_xadd
         return redis
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def producer(self, mock_redis):
         """Create a QueueProducer with mocked Redis."""
-        from src.services.queue.producer import QueueProducer
-
         return QueueProducer(mock_redis)
 
-    @pytest.mark.asyncio
-    async def test_enqueue_signal_adds_to_pending_stream(self, producer, mock_redis):
+    @pytest.fixture(scope="class")
+    def enqueued(self, producer, xadd_calls):
+        """Run every enqueue case in one event loop; (stream, fields) per case."""
+        cases = {
+            "pending": ("signal", "test-event-123", {"symbol": "BTC", "entry_price": 42000}),
+            "event_id": ("signal", "test-event-456", {"symbol": "ETH"}),
+            "enriched": ("enriched", "test-event-789", {"symbol": "BTC", "enriched": True}),
+            "json": (
+                "signal",
+                "test-event",
+                {"symbol": "BTC", "price": 42000.50, "nested": {"key": "value"}},
+            ),
+        }
+
+        async def enqueue_all():
+            for kind, event_id, payload in cases.values():
+                if kind == "enriched":
+                    await producer.enqueue_enriched(event_id, payload)
+                else:
+                    await producer.enqueue_signal(event_id, payload)
+
+        asyncio.run(enqueue_all())
+        return dict(zip(cases, xadd_calls, strict=True))
+
+    def test_enqueue_signal_adds_to_pending_stream(self, enqueued):
         """Test that enqueue_signal adds message to pending signals stream."""
-        event_id = "test-event-123"
-        payload = {"symbol": "BTC", "entry_price": 42000}
+        stream, _ = enqueued["pending"]
+        assert "pending" in stream.lower()
 
-        await producer.enqueue_signal(event_id, payload)
-
-        mock_redis.xadd.assert_called_once()
-        call_args = mock_redis.xadd.call_args
-        # First arg is stream name
-        assert "pending" in call_args[0][0].lower()
-
-    @pytest.mark.asyncio
-    async def test_enqueue_signal_includes_event_id(self, producer, mock_redis):
+    def test_enqueue_signal_includes_event_id(self, enqueued):
         """Test that event_id is included in the message."""
-        event_id = "test-event-456"
-        payload = {"symbol": "ETH"}
-
-        await producer.enqueue_signal(event_id, payload)
-
-        call_args = mock_redis.xadd.call_args
-        message_data = call_args[0][1]
+        _, message_data = enqueued["event_id"]
         assert "event_id" in message_data
-        assert message_data["event_id"] == event_id
+        assert message_data["event_id"] == "test-event-456"
 
-    @pytest.mark.asyncio
-    async def test_enqueue_enriched_adds_to_enriched_stream(self, producer, mock_redis):
+    def test_enqueue_enriched_adds_to_enriched_stream(self, enqueued):
         """Test that enqueue_enriched adds message to enriched signals stream."""
-        event_id = "test-event-789"
-        payload = {"symbol": "BTC", "enriched": True}
+        stream, _ = enqueued["enriched"]
+        assert "enriched" in stream.lower()
 
-        await producer.enqueue_enriched(event_id, payload)
-
-        mock_redis.xadd.assert_called_once()
-        call_args = mock_redis.xadd.call_args
-        # First arg is stream name
-        assert "enriched" in call_args[0][0].lower()
-
-    @pytest.mark.asyncio
-    async def test_enqueue_serializes_payload_to_json(self, producer, mock_redis):
+    def test_enqueue_serializes_payload_to_json(self, enqueued):
         """Test that payload is serialized to JSON."""
-        event_id = "test-event"
-        payload = {"symbol": "BTC", "price": 42000.50, "nested": {"key": "value"}}
-
-        await producer.enqueue_signal(event_id, payload)
-
-        call_args = mock_redis.xadd.call_args
-        message_data = call_args[0][1]
+        _, message_data = enqueued["json"]
         # Payload should be JSON string
         assert "payload" in message_data
         parsed = json.loads(message_data["payload"])
@@ -91,105 +143,89 @@ class TestQueueProducer:
         assert parsed["nested"]["key"] == "value"
 
 
-@pytest.mark.unit
 class TestQueueConsumerBase:
     """Tests for QueueConsumer base class behavior."""
 
     def test_consumer_is_abstract(self):
         """Test that QueueConsumer is an abstract base class."""
-        from src.services.queue.consumer import QueueConsumer
-        import inspect
-
         assert inspect.isabstract(QueueConsumer)
 
-    def test_consumer_requires_process_message(self):
-        """Test that subclasses must implement process_message."""
-        from src.services.queue.consumer import QueueConsumer
-        from abc import abstractmethod
+    @pytest.mark.parametrize("method", ["process_message", "_get_stage_name"])
+    def test_consumer_requires_method(self, method):
+        """Test that subclasses must implement each abstract method."""
+        assert method in QueueConsumer.__abstractmethods__
 
-        # Check that process_message is abstract
-        assert hasattr(QueueConsumer.process_message, '__isabstractmethod__')
+    @pytest.mark.parametrize("retry_count", range(5))
+    def test_backoff_calculation(self, retry_count):
+        """Test exponential backoff calculation with jitter."""
+        # Backoff never touches Redis
+        consumer = _ConcreteConsumer(
+            redis_client=None,
+            stream="test:stream",
+            group="test-group",
+            consumer_name="test-consumer",
+        )
 
-    def test_consumer_requires_get_stage_name(self):
-        """Test that subclasses must implement _get_stage_name."""
-        from src.services.queue.consumer import QueueConsumer
+        delay = consumer._calculate_backoff(retry_count)
 
-        # Check that _get_stage_name is abstract
-        assert hasattr(QueueConsumer._get_stage_name, '__isabstractmethod__')
+        # Base delay doubles each retry up to the cap, then ±25% jitter
+        expected = min(
+            settings.RETRY_BASE_DELAY_MS * 2**retry_count, settings.RETRY_MAX_DELAY_MS
+        ) / 1000
+        assert expected * 0.75 <= delay <= expected * 1.25
 
-    def test_backoff_calculation(self):
-        """Test exponential backoff calculation with jitter."""
-        from src.services.queue.consumer import QueueConsumer
 
-        # Create a concrete implementation for testing
-        class TestConsumer(QueueConsumer):
-            async def process_message(self, event_id, payload):
-                return True
+class TestQueueConsumerRun:
+    """Tests for the consumer loop against in-process streams."""
 
-            def _get_stage_name(self):
-                return "test"
-
-        mock_redis = MagicMock()
-        consumer = TestConsumer(
-            redis_client=mock_redis,
-            stream="test:stream",
+    async def test_run_processes_and_acks_enqueued_signal(self, fake_streams):
+        """Test that a produced signal is consumed, parsed and acknowledged."""
+        consumer = _RecordingConsumer(
+            redis_client=fake_streams,
+            stream=QueueProducer.PENDING_STREAM,
             group="test-group",
             consumer_name="test-consumer",
         )
+        # The group starts at the stream's end ("$"), so create it before producing
+        await consumer.setup()
+        msg_id = await QueueProducer(fake_streams).enqueue_signal("evt-1", {"symbol": "BTC"})
 
-        # Test backoff increases with retry count
-        delay_0 = consumer._calculate_backoff(0)
-        delay_1 = consumer._calculate_backoff(1)
-        delay_2 = consumer._calculate_backoff(2)
+        await asyncio.wait_for(consumer.run(), timeout=1)
 
-        # Base delay is 2 seconds, so delay should approximately double each retry
-        # (with some jitter variance)
-        assert delay_0 > 0
-        assert delay_1 > delay_0 * 0.5  # Account for jitter
-        assert delay_2 > delay_1 * 0.5  # Account for jitter
+        assert consumer.received == [("evt-1", {"symbol": "BTC"})]
+        assert fake_streams.acked[(QueueProducer.PENDING_STREAM, "test-group")] == [msg_id]
 
 
-@pytest.mark.unit
 class TestRedisClientHealth:
     """Tests for Redis client health checking."""
 
     @pytest.mark.asyncio
     async def test_redis_client_ping(self):
         """Test Redis client ping for health checks."""
-        from src.services.queue.redis_client import RedisClient
-
-        mock_redis = MagicMock()
-        mock_redis.ping = AsyncMock(return_value=True)
+        redis = _HealthRedis()
 
-        client = RedisClient(mock_redis)
+        client = RedisClient(redis)
         result = await client.ping()
 
         assert result is True
-        mock_redis.ping.assert_called_once()
+        assert redis.ping_calls == 1
 
     @pytest.mark.asyncio
     async def test_redis_client_xlen(self):
         """Test getting stream length from Redis."""
-        from src.services.queue.redis_client import RedisClient
+        redis = _HealthRedis()
 
-        mock_redis = MagicMock()
-        mock_redis.xlen = AsyncMock(return_value=42)
-
-        client = RedisClient(mock_redis)
+        client = RedisClient(redis)
         length = await client.xlen("lens:signals:pending")
 
         assert length == 42
-        mock_redis.xlen.assert_called_once_with("lens:signals:pending")
+        assert redis.xlen_calls == ["lens:signals:pending"]
 
 
-@pytest.mark.unit
 class TestStreamNames:
     """Tests for stream name constants."""
 
     def test_stream_names_are_consistent(self):
         """Verify stream names follow naming convention."""
-        from src.services.queue.producer import QueueProducer
-
-        # These constants should exist and follow pattern
-        assert hasattr(QueueProducer, "PENDING_STREAM") or True  # May be in config
-        assert hasattr(QueueProducer, "ENRICHED_STREAM") or True
+        assert QueueProducer.PENDING_STREAM == "lens:signals:pending"
+        assert QueueProducer.ENRICHED_STREAM == "lens:signals:enriched"
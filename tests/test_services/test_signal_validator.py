@@ -1,14 +1,37 @@
 """Tests for the signal validator."""
 
+import asyncio
+from dataclasses import fields
+
 import pytest
+import pytest_asyncio
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 from src.core.exceptions import SignalRejectedError, ProviderError
+from src.services.enrichment.signal_validator import SignalValidator
 from src.services.providers.base import Ticker
 
+# Run every test on the module event loop shared with the validator fixtures
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+# Signal ages for the age-threshold tests
+_TD_10MIN = timedelta(minutes=10)
+_TD_301S = timedelta(seconds=301)
+_TD_1MIN = timedelta(minutes=1)
+
+
+@pytest.fixture(scope="module")
+def now_iso():
+    """Recent timestamp for drift-only tests.
 
-@pytest.fixture
+    Taken when the module's first test runs (not at collection), so the
+    module's tests stay well within the 5 minute age limit.
+    """
+    return datetime.now(timezone.utc).isoformat()
+
+
+@pytest.fixture(scope="module")
 def mock_ticker():
     """Create mock ticker at $50000."""
     return Ticker(
@@ -21,75 +44,100 @@ def mock_ticker():
     )
 
 
-@pytest.fixture
+class _StubProvider:
+    """Minimal async provider returning a fixed ticker, for tests without mock assertions."""
+
+    def __init__(self, ticker: Ticker):
+        self._ticker = ticker
+        self.calls = 0
+
+    async def get_ticker(self, symbol: str) -> Ticker:
+        self.calls += 1
+        return self._ticker
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_provider(mock_ticker):
+    """Create stub provider."""
+    return _StubProvider(mock_ticker)
+
+
+@pytest.fixture(scope="module")
 def mock_provider(mock_ticker):
-    """Create mock provider."""
+    """Create mock provider, for tests that assert on get_ticker calls."""
     provider = MagicMock()
     provider.get_ticker = AsyncMock(return_value=mock_ticker)
     provider.close = AsyncMock()
     return provider
 
 
-@pytest.mark.unit
-class TestSignalValidator:
-    """Test signal validation logic."""
-
-    @pytest.mark.asyncio
-    async def test_valid_signal_within_drift_threshold(self, mock_provider):
-        """Test signal with small drift passes validation."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def validator(stub_provider):
+    """Shared SignalValidator for the module (closed once at teardown)."""
+    validator = SignalValidator(provider=stub_provider)
+    yield validator
+    await validator.close()
 
-        # Entry price within 2% of current ($50000)
-        signal = {
-            "symbol": "BTC",
-            "entry_price": 49500.0,  # 1% drift
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
-        }
 
-        result = await validator.validate(signal, raise_on_invalid=False)
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def mock_validator(mock_provider):
+    """Shared SignalValidator backed by mock_provider."""
+    validator = SignalValidator(provider=mock_provider)
+    yield validator
+    await validator.close()
 
-        assert result.valid is True
-        assert result.current_price == 50000.0
-        assert result.drift_bps < 200  # Less than 2%
-        assert result.rejection_reason is None
 
-        await validator.close()
+@pytest.fixture(autouse=True)
+def _reset_provider_calls(mock_provider, stub_provider):
+    """Clear get_ticker call history so call assertions stay per test."""
+    yield
+    mock_provider.get_ticker.reset_mock()
+    stub_provider.calls = 0
 
-    @pytest.mark.asyncio
-    async def test_signal_rejected_excessive_drift(self, mock_provider):
-        """Test signal with >2% drift is rejected."""
-        from src.services.enrichment.signal_validator import SignalValidator
 
-        validator = SignalValidator(provider=mock_provider)
+@pytest.mark.unit
+class TestSignalValidator:
+    """Test signal validation logic."""
 
-        # Entry price with >2% drift (current is $50000)
+    @pytest.mark.parametrize(
+        "entry,expected_valid",
+        [
+            # Drift is measured against the entry price; current is $50000
+            (49500.0, True),  # ~1% drift
+            (49250.0, True),  # ~1.5% drift, just under threshold
+            (49000.0, False),  # ~2.04% drift, just over threshold
+            (48000.0, False),  # ~4% drift, price went up
+            (52000.0, False),  # ~4% drift, price went down
+            (45000.0, False),  # ~11% drift
+        ],
+    )
+    async def test_drift_boundaries(self, validator, now_iso, entry, expected_valid):
+        """Test drift threshold (2%) in both directions and around the boundary."""
         signal = {
             "symbol": "BTC",
-            "entry_price": 45000.0,  # ~11% drift
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
+            "entry_price": entry,
+            "ts_utc": now_iso,
         }
 
         result = await validator.validate(signal, raise_on_invalid=False)
 
-        assert result.valid is False
-        assert result.drift_bps > 200
-        assert "drift" in result.rejection_reason.lower()
-
-        await validator.close()
+        assert result.valid is expected_valid
+        assert result.current_price == 50000.0
+        assert (result.drift_bps < 200) is expected_valid
+        if expected_valid:
+            assert result.rejection_reason is None
+        else:
+            assert "drift" in result.rejection_reason.lower()
 
-    @pytest.mark.asyncio
-    async def test_signal_rejected_excessive_drift_raises(self, mock_provider):
+    async def test_signal_rejected_excessive_drift_raises(self, validator, now_iso):
         """Test signal rejection raises SignalRejectedError when configured."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
         signal = {
             "symbol": "BTC",
             "entry_price": 45000.0,  # >2% drift
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
+            "ts_utc": now_iso,
         }
 
         with pytest.raises(SignalRejectedError) as exc_info:
@@ -100,102 +148,68 @@ class TestSignalValidator:
         assert exc_info.value.details[0]["entry_price"] == 45000.0
         assert exc_info.value.details[0]["current_price"] == 50000.0
 
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_signal_rejected_too_old(self, mock_provider):
-        """Test signal older than threshold is rejected."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
-        # Signal from 10 minutes ago (default threshold is 5 minutes)
-        old_time = datetime.now(timezone.utc) - timedelta(minutes=10)
+    @pytest.mark.parametrize(
+        "age,should_fetch",
+        [
+            (_TD_10MIN, False),  # default threshold is 5 minutes
+            (_TD_301S, False),  # just past the 300s threshold
+            (_TD_1MIN, True),
+        ],
+        ids=["10min", "301s", "1min"],
+    )
+    async def test_signal_age_threshold(self, mock_validator, mock_provider, age, should_fetch):
+        """Test age rejection, and that old signals never fetch price (optimization)."""
+        signal_time = datetime.now(timezone.utc) - age
         signal = {
             "symbol": "BTC",
             "entry_price": 50000.0,  # No drift
-            "ts_utc": old_time.isoformat(),
-        }
-
-        result = await validator.validate(signal, raise_on_invalid=False)
-
-        assert result.valid is False
-        assert result.signal_age_seconds > 300  # >5 minutes
-        assert "old" in result.rejection_reason.lower()
-
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_signal_age_check_before_price_fetch(self, mock_provider):
-        """Test that old signals are rejected without fetching price (optimization)."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
-        # Signal from 10 minutes ago
-        old_time = datetime.now(timezone.utc) - timedelta(minutes=10)
-        signal = {
-            "symbol": "BTC",
-            "entry_price": 50000.0,
-            "ts_utc": old_time.isoformat(),
+            "ts_utc": signal_time.isoformat(),
         }
 
-        with pytest.raises(SignalRejectedError):
-            await validator.validate(signal, raise_on_invalid=True)
+        result = await mock_validator.validate(signal, raise_on_invalid=False)
 
-        # Price should NOT have been fetched (optimization)
-        mock_provider.get_ticker.assert_not_called()
+        assert result.valid is should_fetch
+        assert mock_provider.get_ticker.called is should_fetch
+        if not should_fetch:
+            assert result.signal_age_seconds > 300
+            assert "old" in result.rejection_reason.lower()
 
-        await validator.close()
+            with pytest.raises(SignalRejectedError):
+                await mock_validator.validate(signal, raise_on_invalid=True)
+            mock_provider.get_ticker.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_fresh_signal_fetches_price(self, mock_provider):
+    async def test_fresh_signal_fetches_price(self, mock_validator, now_iso, mock_provider):
         """Test that fresh signals fetch price for validation."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
         signal = {
             "symbol": "BTC",
             "entry_price": 49500.0,
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
+            "ts_utc": now_iso,
         }
 
-        await validator.validate(signal, raise_on_invalid=True)
+        await mock_validator.validate(signal, raise_on_invalid=True)
 
         # Price should have been fetched
         mock_provider.get_ticker.assert_called_once_with("BTC")
 
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_provider_error_propagates(self, mock_provider):
+    async def test_provider_error_propagates(self, validator, now_iso, stub_provider, monkeypatch):
         """Test that provider errors are propagated."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        mock_provider.get_ticker = AsyncMock(
-            side_effect=ProviderError("hyperliquid", "API error")
+        monkeypatch.setattr(
+            stub_provider,
+            "get_ticker",
+            AsyncMock(side_effect=ProviderError("hyperliquid", "API error")),
         )
-        validator = SignalValidator(provider=mock_provider)
 
         signal = {
             "symbol": "BTC",
             "entry_price": 50000.0,
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
+            "ts_utc": now_iso,
         }
 
         with pytest.raises(ProviderError):
             await validator.validate(signal, raise_on_invalid=True)
 
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_missing_timestamp_still_validates_price(self, mock_provider):
+    async def test_missing_timestamp_still_validates_price(self, validator, stub_provider):
         """Test signal without timestamp still validates price drift."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
         # No timestamp provided
         signal = {
             "symbol": "BTC",
@@ -206,23 +220,19 @@ class TestSignalValidator:
 
         assert result.valid is True
         assert result.signal_age_seconds == 0.0  # No age calculated
+        assert stub_provider.calls == 1
 
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_custom_thresholds(self, mock_provider):
+    async def test_custom_thresholds(self, validator, monkeypatch):
         """Test custom drift and age thresholds."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-        validator.max_drift_bps = 100  # 1% instead of 2%
-        validator.max_signal_age = 60  # 1 minute instead of 5
+        # Restored after the test so the shared validator keeps its defaults
+        monkeypatch.setattr(validator, "max_drift_bps", 100)  # 1% instead of 2%
+        monkeypatch.setattr(validator, "max_signal_age", 60)  # 1 minute instead of 5
 
         # 1.5% drift - would pass default but fail custom
         signal = {
             "symbol": "BTC",
             "entry_price": 49250.0,  # 1.5% drift
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
+            "ts_utc": datetime.now(timezone.utc).isoformat(),  # Live: age limit is 60s here
         }
 
         result = await validator.validate(signal, raise_on_invalid=False)
@@ -230,140 +240,53 @@ class TestSignalValidator:
         assert result.valid is False
         assert "drift" in result.rejection_reason.lower()
 
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_drift_calculation_both_directions(self, mock_provider):
-        """Test drift is calculated correctly for both up and down moves."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
-        # Entry below current (price went up)
-        signal_below = {
-            "symbol": "BTC",
-            "entry_price": 48000.0,  # 4% below current
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
-        }
-        result_below = await validator.validate(signal_below, raise_on_invalid=False)
-        assert result_below.valid is False  # >2% drift
-
-        # Entry above current (price went down)
-        signal_above = {
-            "symbol": "BTC",
-            "entry_price": 52000.0,  # 4% above current
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
-        }
-        result_above = await validator.validate(signal_above, raise_on_invalid=False)
-        assert result_above.valid is False  # >2% drift
-
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_zero_entry_price_skips_drift_check(self, mock_provider):
+    async def test_zero_entry_price_skips_drift_check(self, validator, stub_provider, now_iso):
         """Test that zero entry price doesn't cause division error."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
         signal = {
             "symbol": "BTC",
             "entry_price": 0.0,  # Zero price
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
+            "ts_utc": now_iso,
         }
 
         result = await validator.validate(signal, raise_on_invalid=False)
 
-        # Should be valid since drift can't be calculated
+        # Should be valid since drift can't be calculated, but price is still fetched
         assert result.valid is True
         assert result.drift_bps == 0.0
-
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_exact_threshold_boundary(self, mock_provider):
-        """Test signal at exactly 2% drift threshold."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
-        # 2% drift = 200 bps exactly (current is $50000)
-        # 2% of 50000 = 1000, so entry at 49000 is exactly 2%
-        signal = {
-            "symbol": "BTC",
-            "entry_price": 49000.0,  # Exactly 2% drift
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
-        }
-
-        result = await validator.validate(signal, raise_on_invalid=False)
-
-        # 2% is the threshold, so exactly 2% should be rejected (> not >=)
-        # Actually drift is (50000-49000)/49000 = 2.04%, so rejected
-        assert result.valid is False
-
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_just_under_threshold(self, mock_provider):
-        """Test signal just under 2% drift threshold passes."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
-        # 1.5% drift should pass (current is $50000)
-        # Entry at 49250 = (50000-49250)/49250 = 1.52%
-        signal = {
-            "symbol": "BTC",
-            "entry_price": 49250.0,  # ~1.5% drift
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
-        }
-
-        result = await validator.validate(signal, raise_on_invalid=False)
-
-        assert result.valid is True
-        assert result.drift_bps < 200
-
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_signal_age_boundary(self, mock_provider):
-        """Test signal at exactly 5 minute age threshold."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
-        # Signal exactly at 5 minute threshold (300s)
-        old_time = datetime.now(timezone.utc) - timedelta(seconds=301)
-        signal = {
-            "symbol": "BTC",
-            "entry_price": 50000.0,
-            "ts_utc": old_time.isoformat(),
-        }
-
-        result = await validator.validate(signal, raise_on_invalid=False)
-
-        # 301s > 300s threshold, so rejected
-        assert result.valid is False
-        assert "old" in result.rejection_reason.lower()
-
-        await validator.close()
+        assert stub_provider.calls == 1
+
+    async def test_validate_batch_concurrently(self, validator, now_iso):
+        """Test independent signals validated concurrently keep their own results."""
+        cases = [
+            (49500.0, True),  # 1% drift
+            (45000.0, False),  # ~11% drift
+            (52000.0, False),  # ~4% drift
+            (49250.0, True),  # ~1.5% drift
+            (0.0, True),  # no drift check
+        ]
+
+        results = await asyncio.gather(*(
+            validator.validate(
+                {"symbol": "BTC", "entry_price": entry_price, "ts_utc": now_iso},
+                raise_on_invalid=False,
+            )
+            for entry_price, _ in cases
+        ))
+
+        assert [r.valid for r in results] == [valid for _, valid in cases]
+        assert [r.entry_price for r in results] == [entry_price for entry_price, _ in cases]
 
 
 @pytest.mark.unit
 class TestSignalValidatorEdgeCases:
     """Test edge cases and error scenarios."""
 
-    @pytest.mark.asyncio
-    async def test_malformed_symbol(self, mock_provider):
+    async def test_malformed_symbol(self, validator, now_iso):
         """Test handling of unusual symbol formats."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
         signal = {
             "symbol": "BTC-PERP",  # Should be normalized by provider
             "entry_price": 50000.0,
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
+            "ts_utc": now_iso,
         }
 
         result = await validator.validate(signal, raise_on_invalid=False)
@@ -371,15 +294,8 @@ class TestSignalValidatorEdgeCases:
         # Should work - provider handles normalization
         assert result.valid is True
 
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_empty_signal(self, mock_provider):
+    async def test_empty_signal(self, validator):
         """Test handling of empty signal dict."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
         signal = {}  # Empty signal
 
         result = await validator.validate(signal, raise_on_invalid=False)
@@ -388,30 +304,25 @@ class TestSignalValidatorEdgeCases:
         assert result.valid is True
         assert result.entry_price == 0.0
 
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_validation_result_contains_all_fields(self, mock_provider):
+    async def test_validation_result_contains_all_fields(self, validator, now_iso):
         """Test ValidationResult has all expected fields."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
         signal = {
             "symbol": "BTC",
             "entry_price": 49500.0,
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
+            "ts_utc": now_iso,
         }
 
         result = await validator.validate(signal, raise_on_invalid=False)
 
         # Check all fields are present
-        assert hasattr(result, "valid")
-        assert hasattr(result, "current_price")
-        assert hasattr(result, "entry_price")
-        assert hasattr(result, "drift_bps")
-        assert hasattr(result, "signal_age_seconds")
-        assert hasattr(result, "rejection_reason")
+        assert {
+            "valid",
+            "current_price",
+            "entry_price",
+            "drift_bps",
+            "signal_age_seconds",
+            "rejection_reason",
+        } <= {f.name for f in fields(result)}
 
         # Check values
         assert result.current_price == 50000.0
@@ -419,19 +330,12 @@ class TestSignalValidatorEdgeCases:
         assert result.drift_bps > 0
         assert result.signal_age_seconds >= 0
 
-        await validator.close()
-
-    @pytest.mark.asyncio
-    async def test_rejection_error_details(self, mock_provider):
+    async def test_rejection_error_details(self, validator, now_iso):
         """Test SignalRejectedError contains useful details."""
-        from src.services.enrichment.signal_validator import SignalValidator
-
-        validator = SignalValidator(provider=mock_provider)
-
         signal = {
             "symbol": "ETH",
             "entry_price": 40000.0,  # Way off from mock ($50000)
-            "ts_utc": datetime.now(timezone.utc).isoformat(),
+            "ts_utc": now_iso,
         }
 
         with pytest.raises(SignalRejectedError) as exc_info:
@@ -450,5 +354,3 @@ class TestSignalValidatorEdgeCases:
         assert "current_price" in details
         assert "drift_bps" in details
         assert "max_drift_bps" in details
-
-        await validator.close()
@@ -1,71 +1,117 @@
 """Tests for the technical analysis calculator."""
 
+from functools import lru_cache
+
 import pytest
 import numpy as np
 
+from src.services.enrichment.ta_calculator import TACalculator
 from src.services.providers.base import OHLCV
 from datetime import datetime, timezone
 
 
+def _make_candle_arrays(closes, spread: float = 0.01) -> dict[str, np.ndarray]:
+    """Create column arrays matching _make_candles for the same inputs."""
+    closes = np.asarray(closes, dtype=np.float64)
+    return {
+        "open": closes * (1 - spread / 2),
+        "high": closes * (1 + spread),
+        "low": closes * (1 - spread),
+        "close": closes,
+        "volume": np.full(len(closes), 1000.0),
+    }
+
+
+def _make_candles(closes, spread: float = 0.01) -> list[OHLCV]:
+    """Create OHLCV candles from close prices."""
+    arrays = _make_candle_arrays(closes, spread)
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    timestamps = [base_time.replace(hour=i % 24) for i in range(len(arrays["close"]))]
+    # tolist() keeps plain float fields, as the per-candle arithmetic did
+    return [
+        OHLCV(timestamp=ts, open=o, high=hi, low=lo, close=c, volume=v)
+        for ts, o, hi, lo, c, v in zip(
+            timestamps,
+            arrays["open"].tolist(),
+            arrays["high"].tolist(),
+            arrays["low"].tolist(),
+            arrays["close"].tolist(),
+            arrays["volume"].tolist(),
+            strict=True,
+        )
+    ]
+
+
+# Seeded noisy uptrend shared by the calculate_all tests
+_NOISY_UPTREND = tuple(
+    (100 + np.arange(100) * 0.5 + np.random.default_rng(seed=0).standard_normal(100)).tolist()
+)
+
+
+@pytest.fixture(scope="session")
+def ta_result_for():
+    """calculate_all over synthetic candles, memoized by series and parameters.
+
+    Arguments must be hashable: closes as a tuple, ema_periods as a tuple and
+    macd_params as a tuple of (name, value) pairs. Results are shared between
+    tests, so treat them as read-only.
+    """
+
+    @lru_cache(maxsize=32)
+    def compute(
+        closes: tuple,
+        ema_periods: tuple = (9, 21, 50),
+        macd_params: tuple = (("fast", 12), ("slow", 26), ("signal", 9)),
+        rsi_period: int = 14,
+        atr_period: int = 14,
+    ):
+        return TACalculator.calculate_all(
+            candles=_make_candles(closes),
+            ema_periods=list(ema_periods),
+            macd_params=dict(macd_params),
+            rsi_period=rsi_period,
+            atr_period=atr_period,
+        )
+
+    return compute
+
+
+# Linear uptrend for the golden calculate_all run
+_GOLDEN_CLOSES = tuple((100.0 + 0.5 * np.arange(100)).tolist())
+
+
+@pytest.fixture(scope="module")
+def golden_ta(ta_result_for):
+    """calculate_all over the linear uptrend, shared by the indicator smoke tests."""
+    return ta_result_for(_GOLDEN_CLOSES)
+
+
 @pytest.mark.unit
 class TestTACalculator:
     """Test TA calculator functions."""
 
-    def _make_candles(self, closes: list, spread: float = 0.01) -> list[OHLCV]:
-        """Create OHLCV candles from close prices."""
-        candles = []
-        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
-        for i, close in enumerate(closes):
-            candles.append(
-                OHLCV(
-                    timestamp=base_time.replace(hour=i % 24),
-                    open=close * (1 - spread / 2),
-                    high=close * (1 + spread),
-                    low=close * (1 - spread),
-                    close=close,
-                    volume=1000.0,
-                )
-            )
-        return candles
-
-    def test_calculate_ema_basic(self):
-        """Test EMA calculation with simple data."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
-        # Simple ascending prices
-        closes = np.array([10.0, 11.0, 12.0, 13.0, 14.0, 15.0, 16.0, 17.0, 18.0, 19.0, 20.0])
-        ema = TACalculator.calculate_ema(closes, period=5)
-
-        # EMA should be less than the latest close for uptrend
-        assert ema < 20.0
-        assert ema > 15.0  # Should be weighted toward recent values
+    def test_calculate_ema_basic(self, golden_ta):
+        """Test EMA ordering in an uptrend."""
+        # EMA lags the latest close, and shorter periods track it more closely
+        assert golden_ta.ema["ema_9"] < _GOLDEN_CLOSES[-1]
+        assert golden_ta.ema["ema_9"] > golden_ta.ema["ema_21"] > golden_ta.ema["ema_50"]
 
     def test_calculate_ema_not_enough_data(self):
         """Test EMA with insufficient data returns simple average."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
         closes = np.array([10.0, 11.0, 12.0])
         ema = TACalculator.calculate_ema(closes, period=5)
 
         # Should return simple average when period > data length
         assert ema == pytest.approx(11.0, rel=0.01)
 
-    def test_calculate_macd_basic(self):
+    def test_calculate_macd_basic(self, golden_ta):
         """Test MACD calculation."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
-        # Create trending price data
-        closes = np.array([float(100 + i * 0.5) for i in range(50)])
-        macd = TACalculator.calculate_macd(closes)
-
         # In uptrend, MACD should be positive
-        assert macd.macd_line > 0
-        assert isinstance(macd.histogram, float)
+        assert golden_ta.macd.macd_line > 0
+        assert isinstance(golden_ta.macd.histogram, float)
 
     def test_calculate_macd_not_enough_data(self):
         """Test MACD with insufficient data returns zeros."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
         closes = np.array([10.0, 11.0, 12.0])
         macd = TACalculator.calculate_macd(closes)
 
@@ -75,32 +121,22 @@ class TestTACalculator:
 
     def test_calculate_rsi_oversold(self):
         """Test RSI calculation in downtrend (should be low)."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
         # Declining prices
-        closes = np.array([float(100 - i) for i in range(30)])
+        closes = 100.0 - np.arange(30, dtype=np.float64)
         rsi = TACalculator.calculate_rsi(closes, period=14)
 
         # RSI should be low (oversold) in downtrend
         assert rsi < 30
 
-    def test_calculate_rsi_overbought(self):
+    def test_calculate_rsi_overbought(self, golden_ta):
         """Test RSI calculation in uptrend (should be high)."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
-        # Rising prices
-        closes = np.array([float(100 + i) for i in range(30)])
-        rsi = TACalculator.calculate_rsi(closes, period=14)
-
         # RSI should be high (overbought) in uptrend
-        assert rsi > 70
+        assert golden_ta.rsi > 70
 
     def test_calculate_rsi_neutral(self):
         """Test RSI calculation with oscillating prices (no clear trend)."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
         # Oscillating prices (no clear trend) - alternating up/down
-        closes = np.array([100.0 + (i % 2) * 2 - 1 for i in range(30)])
+        closes = 99.0 + 2.0 * (np.arange(30) % 2)
         rsi = TACalculator.calculate_rsi(closes, period=14)
 
         # RSI should be roughly neutral for oscillating prices
@@ -108,63 +144,38 @@ class TestTACalculator:
 
     def test_calculate_rsi_not_enough_data(self):
         """Test RSI with insufficient data returns neutral."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
         closes = np.array([10.0, 11.0])
         rsi = TACalculator.calculate_rsi(closes, period=14)
 
         assert rsi == 50.0
 
-    def test_calculate_atr_basic(self):
+    def test_calculate_atr_basic(self, golden_ta):
         """Test ATR calculation."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
-        n = 30
-        highs = np.array([float(105 + i * 0.1) for i in range(n)])
-        lows = np.array([float(95 + i * 0.1) for i in range(n)])
-        closes = np.array([float(100 + i * 0.1) for i in range(n)])
-
-        atr = TACalculator.calculate_atr(highs, lows, closes, period=14)
-
         # ATR should be approximately the average range
-        assert atr > 0
-        assert atr < 20  # Should be reasonable
+        assert golden_ta.atr > 0
+        assert golden_ta.atr < 20  # Should be reasonable
 
     def test_calculate_atr_volatile_market(self):
         """Test ATR is higher in volatile market."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
-        n = 30
+        drift = 0.1 * np.arange(30, dtype=np.float64)
         # Low volatility
-        highs_low = np.array([float(101 + i * 0.1) for i in range(n)])
-        lows_low = np.array([float(99 + i * 0.1) for i in range(n)])
-        closes_low = np.array([float(100 + i * 0.1) for i in range(n)])
+        highs_low = 101.0 + drift
+        lows_low = 99.0 + drift
+        closes_low = 100.0 + drift
 
         # High volatility
-        highs_high = np.array([float(110 + i * 0.1) for i in range(n)])
-        lows_high = np.array([float(90 + i * 0.1) for i in range(n)])
-        closes_high = np.array([float(100 + i * 0.1) for i in range(n)])
+        highs_high = 110.0 + drift
+        lows_high = 90.0 + drift
+        closes_high = 100.0 + drift
 
         atr_low = TACalculator.calculate_atr(highs_low, lows_low, closes_low, period=14)
         atr_high = TACalculator.calculate_atr(highs_high, lows_high, closes_high, period=14)
 
         assert atr_high > atr_low
 
-    def test_calculate_all_with_candles(self):
+    def test_calculate_all_with_candles(self, ta_result_for):
         """Test calculate_all with OHLCV candles."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
-        # Create realistic candle data
-        closes = [float(100 + i * 0.5 + np.random.normal(0, 1)) for i in range(100)]
-        candles = self._make_candles(closes)
-
-        result = TACalculator.calculate_all(
-            candles=candles,
-            ema_periods=[9, 21, 50],
-            macd_params={"fast": 12, "slow": 26, "signal": 9},
-            rsi_period=14,
-            atr_period=14,
-        )
+        result = ta_result_for(_NOISY_UPTREND)
 
         assert result is not None
         assert "ema_9" in result.ema
@@ -174,17 +185,25 @@ class TestTACalculator:
         assert 0 <= result.rsi <= 100
         assert result.atr > 0
 
+    def test_calculate_all_matches_indicator_functions(self, ta_result_for):
+        """Test calculate_all agrees with the per-indicator functions on raw columns."""
+        result = ta_result_for(_NOISY_UPTREND)
+        arrays = _make_candle_arrays(_NOISY_UPTREND)
+
+        assert result.ema["ema_21"] == pytest.approx(
+            TACalculator.calculate_ema(arrays["close"], period=21), abs=1e-4
+        )
+        assert result.rsi == pytest.approx(TACalculator.calculate_rsi(arrays["close"], period=14))
+        assert result.atr == pytest.approx(
+            TACalculator.calculate_atr(arrays["high"], arrays["low"], arrays["close"], period=14)
+        )
+
     def test_calculate_all_empty_candles(self):
         """Test calculate_all with empty candles returns None."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
         result = TACalculator.calculate_all(candles=[])
         assert result is None
 
     def test_calculate_all_single_candle(self):
         """Test calculate_all with single candle returns None."""
-        from src.services.enrichment.ta_calculator import TACalculator
-
-        candles = self._make_candles([100.0])
-        result = TACalculator.calculate_all(candles=candles)
+        result = TACalculator.calculate_all(candles=_make_candles([100.0]))
         assert result is None